@@ -1,19 +1,30 @@
 # from project root run: uv run -m scripts.interact
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from src.api import get_students, get_students_topics, start_conversation, interact, submit_mse_predictions, evaluate_tutoring
 
 
+MAX_WORKERS = 8
+
+
+@functools.lru_cache(maxsize=1024)
+def _camel(name: str) -> str:
+    words = name.split()
+    return words[0].lower() + ''.join(w.capitalize() for w in words[1:])
+
+
 def generate_all_student_topic_pairs() -> dict:
     student_topic_pairs = dict()
 
     student_dict = create_student_dict()
-    for student_name, student_id in student_dict.items():
-        topics = get_students_topics(student_id)['topics']
-        for topic in topics:
+    # fetch every student's topics concurrently instead of one request at a time
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        topics_per_student = list(executor.map(get_students_topics, student_dict.values()))
+    for (student_name, student_id), student_topics in zip(student_dict.items(), topics_per_student):
+        for topic in student_topics['topics']:
             topic_id = topic['id']
-            topic_name = topic['name'].split()
-            topic_name_camel_case = topic_name[0].lower() + ''.join(w.capitalize() for w in topic_name[1:])
-            student_topic_key = student_name + "-" + topic_name_camel_case
-            student_topic_pairs[student_topic_key] = (student_id, topic_id)
+            topic_name_camel_case = _camel(topic['name'])
+            student_topic_pairs[(student_name, topic_name_camel_case)] = (student_id, topic_id)
 
     return student_topic_pairs
 
@@ -24,36 +35,36 @@ def create_student_dict() -> dict:
     for student in students:
         id = student['id']
         name = student['name'].split()[0]
-        student_dict[name.split()[0]] = id
+        student_dict[name] = id
     return student_dict
 
 if __name__ == "__main__":
     predictions_dict = {}
-    for i in range(3):
+    student_topic_pairs = generate_all_student_topic_pairs()
+    pairs = list(student_topic_pairs)
+    menu = "\n".join(f"{i+1}. {name}-{topic}" for i, (name, topic) in enumerate(pairs))
+    prompt = f"\033[32mEnter the pair (1-{len(pairs)}):\033[0m "
+    executor = ThreadPoolExecutor(max_workers=1)
+    for _round in range(3):
         print("===== CHAT WITH STUDENTS =====")
-        student_topic_pairs = generate_all_student_topic_pairs()
         print("Choose one of the following pairs:")
-        for i, pair in enumerate(student_topic_pairs):
-            print(f"{i+1}. {pair}")
-        pair_num = int(input("\033[32mEnter the pair (1-3):\033[0m "))
-        if pair_num == 1:
-            pair = "Alex-linearFunctions"
-        elif pair_num == 2:
-            pair = "Sam-quadraticEquations"
-        elif pair_num == 3:
-            pair = "Maya-thermodynamicsBasics"
-        else:
+        print(menu)
+        pair_num = input(prompt)
+        while not pair_num.isdigit() or not 1 <= int(pair_num) <= len(pairs):
             print("Unknown pair")
-            exit
+            pair_num = input(prompt)
+        pair = pairs[int(pair_num) - 1]
         id = student_topic_pairs[pair]
         student_id, topic_id = id[0], id[1]
-        conversation_id = start_conversation(student_id, topic_id)['conversation_id']
+        # start the conversation in the background while the first question is being typed
+        conversation = executor.submit(start_conversation, student_id, topic_id)
 
         print("\n===== CONVERSATION STARTS ======")
         for i in range(10):
             tutor_message = input(f"Question {i+1}: ")
             if tutor_message == "done":
                 break
+            conversation_id = conversation.result()['conversation_id']
             student_response = interact(conversation_id, tutor_message)['student_response']
             print(f"{student_response}\n")
         print("===== CONVERSATION ENDS ======")
@@ -61,6 +72,7 @@ if __name__ == "__main__":
         print("\nEVALUATION:")
         prediction_level = int(input("Submit your prediction level: "))
         predictions_dict[(student_id, topic_id)] = prediction_level
+    executor.shutdown()
 
     mse_result = submit_mse_predictions(predictions_dict)['mse_score']
     tutoring_quality = evaluate_tutoring()['score']
@@ -1,45 +1,71 @@
 import dspy
-import os
-from typing import Optional, List
-from dotenv import load_dotenv
-load_dotenv()
+import functools
+import logging
+from collections import deque
+from typing import Optional, List, Deque, Union
+from src.config import GEMINI_API_KEY, OPENAI_API_KEY
+
+logger = logging.getLogger(__name__)
+
+# only the most recent answers are sent back to the LM, each truncated
+MAX_HISTORY = 8
+MAX_ANSWER_CHARS = 500
+
+# a stuck LM request fails after LM_TIMEOUT seconds instead of stalling the session
+LM_TIMEOUT = 60
+LM_NUM_RETRIES = 3
+
+DIFFICULTY_LEVELS = {1: "very easy", 2: "easy", 3: "medium", 4: "hard", 5: "very hard"}
 
 class GenerateQuestion(dspy.Signature):
     """Generate an educational question appropriate for the grade level and topic to help tutor a student."""
 
     grade_level: str = dspy.InputField(desc="The student's grade level (e.g., '5th grade', 'high school')")
     topic: str = dspy.InputField(desc="The subject/topic for the question")
-    difficulty: str = dspy.OutputField(desc="Difficulty level: very easy, easy, medium, hard, or very hard")
+    difficulty: str = dspy.InputField(desc="Difficulty level: very easy, easy, medium, hard, or very hard")
     previous_answers: Optional[str] = dspy.InputField(desc="Previous answers to build upon, if any", default=None)
 
     question: str = dspy.OutputField(desc="The generated educational question")
     answer: str = dspy.OutputField(desc="The correct answer to the question that a student should give.")
 
 
+# built once at import; the LM is supplied per call through dspy.context
+_QUESTION_GENERATOR = dspy.ChainOfThought(GenerateQuestion)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_lm(model: str, api_key: str) -> dspy.LM:
+    """Build one dspy.LM per (model, api_key) and share it across agents."""
+    return dspy.LM(model=model, api_key=api_key, timeout=LM_TIMEOUT, num_retries=LM_NUM_RETRIES)
+
+
 class QuestionAgent:
 
     def __init__(self, api_key:str, model:str):
      
-        self.lm = dspy.LM(model=model, api_key=api_key)
-        dspy.configure(lm=self.lm)
+        self.lm = _get_lm(model, api_key)
 
-        self.answer_history: List[str] = []
-        self.generator = dspy.ChainOfThought(GenerateQuestion)
+        self.answer_history: Deque[str] = deque(maxlen=MAX_HISTORY)
+        self.generator = _QUESTION_GENERATOR
 
-    def generate(self, grade_level:str, topic:str, difficulty:str, previous_answers: Optional[List[str]] = None) -> dict:
-        
-        difficulty = {1:"very easy", 2:"easy", 3:"medium", 4:"hard", 5:"very hard"}
+    def generate(self, grade_level:str, topic:str, difficulty:Union[int, str], previous_answers: Optional[List[str]] = None) -> dict:
         """Generate a question, optionally based on previous answers."""
 
-        answers = previous_answers or self.answer_history
+        difficulty = DIFFICULTY_LEVELS.get(difficulty, difficulty)
+
+        if previous_answers:
+            answers = [answer[:MAX_ANSWER_CHARS] for answer in previous_answers[-MAX_HISTORY:]]
+        else:
+            answers = self.answer_history
         answers_str = "\n".join(answers) if answers else None
-        print("answer_string", answers_str)
-        result = self.generator(
-            grade_level=grade_level,
-            topic=topic,
-            difficulty=difficulty,
-            previous_answers=answers_str
-        )
+        logger.debug("answer_string %s", answers_str)
+        with dspy.context(lm=self.lm):
+            result = self.generator(
+                grade_level=grade_level,
+                topic=topic,
+                difficulty=difficulty,
+                previous_answers=answers_str
+            )
 
         return {
             "question": result.question,
@@ -48,7 +74,7 @@ class QuestionAgent:
 
     def add_answer(self, answer: str):
         """Track an answer for adaptive question generation."""
-        self.answer_history.append(answer)
+        self.answer_history.append(answer[:MAX_ANSWER_CHARS])
 
 if __name__ == "__main__": 
     
@@ -59,10 +85,10 @@ if __name__ == "__main__":
     
     if provider == "gemini":
         model = "gemini/gemini-2.5-flash"
-        api_key = os.getenv("GEMINI_API_KEY")
+        api_key = GEMINI_API_KEY
     elif provider == "openai":
         model = "openai/gpt-5-mini"
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = OPENAI_API_KEY
 
     question_agent = QuestionAgent(api_key=api_key, model=model)
     print(question_agent.generate(grade_level=grade_level, difficulty=1, topic=topic))
\ No newline at end of file
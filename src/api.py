@@ -9,94 +9,149 @@ List of Functions:
 - submit_mse_predictions(predictions_dict)
 - evaluate_tutoring()
 """
-import requests
+import functools
+import inspect
+import json
 import os
-from dotenv import load_dotenv
-
-
-load_dotenv()
+import random
+import tempfile
+import time
+import requests
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from src.config import API_KEY
 
 
 BASE_URL = "https://knowunity-agent-olympics-2026-api.vercel.app"
-API_KEY = os.getenv("API_KEY")
 SET_TYPE = "mini_dev"
-
-
+READ_HEADERS = {
+    "accept": "application/json",
+}
+AUTH_HEADERS = {
+    "accept": "application/json",
+    "content-type": "application/json",
+    "X-Api-Key": API_KEY,
+}
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".api_cache"
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+# one keep-alive session so repeated calls reuse the same TCP/TLS connection;
+# the pool is sized for concurrent callers such as the topic fan-out in scripts/interact.py
+POOL_SIZE = 32
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE))
+TIMEOUT = 30  # seconds, so a stalled request cannot hang a session
+RETRY_ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _cached(func):
+    """
+    Cache a read-only endpoint on disk for CACHE_TTL seconds, keyed by function
+    name and all arguments (defaults included). Each call returns a freshly
+    parsed object, so callers can't mutate the cached data.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = "-".join([func.__name__, *(f"{name}={value}" for name, value in bound.arguments.items())])
+        path = CACHE_DIR / f"{key}.json"
+        try:
+            if time.time() - path.stat().st_mtime < CACHE_TTL:
+                return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            pass  # missing, unreadable or truncated entry: refetch
+        data = func(*args, **kwargs)
+        CACHE_DIR.mkdir(exist_ok=True)
+        # write to a temp file and rename, so an interrupted write never leaves a partial entry
+        with tempfile.NamedTemporaryFile("w", dir=CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+            json.dump(data, tmp)
+        os.replace(tmp.name, path)
+        return data
+    return wrapper
+
+
+def _post_with_retry(url: str, payload: dict, headers: dict):
+    """
+    POST with exponential backoff (plus jitter) on connection errors and
+    transient 429/5xx responses. Only use for idempotent requests.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            response = _session.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == RETRY_ATTEMPTS - 1:
+                return response
+        time.sleep(2 ** attempt + random.random())
+
+
+@_cached
 def get_students(set_type: str = SET_TYPE):
     url = f"{BASE_URL}/students"
     params = {
         "set_type": set_type
     }
-    headers = {
-        "accept": "application/json"
-    }
-    response = requests.get(url, params=params, headers=headers)
+    response = _session.get(url, params=params, headers=READ_HEADERS, timeout=TIMEOUT)
+    response.raise_for_status()
     data = response.json()
     return data
 
 
+@_cached
 def get_students_topics(student_id: str):
     url = f"{BASE_URL}/students/{student_id}/topics"
-    headers = {
-        "accept": "application/json"
-    }
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=READ_HEADERS, timeout=TIMEOUT)
+    response.raise_for_status()
     data = response.json()
     return data
 
 
+@_cached
 def get_subjects():
     url = f"{BASE_URL}/subjects"
-    headers = {
-        "accept": "application/json"
-    }
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=READ_HEADERS, timeout=TIMEOUT)
+    response.raise_for_status()
     data = response.json()
 
     return data
 
 
+@_cached
 def get_topics(subject_id: str):
     url = f"{BASE_URL}/topics"
     params = {
         "subject_id": subject_id
     }
-    headers = {
-        "accept": "application/json"
-    }
-    response = requests.get(url, headers=headers, params=params)
+    response = _session.get(url, headers=READ_HEADERS, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
     data = response.json()
     return data
 
 
 def start_conversation(student_id: str, topic_id: str):
     url = f"{BASE_URL}/interact/start"
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "X-Api-Key": API_KEY,
-    }
     payload = {
         "student_id": student_id,
         "topic_id": topic_id,
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _session.post(url, json=payload, headers=AUTH_HEADERS, timeout=TIMEOUT)
     data = response.json()
     return data
 
 
 def interact(conversation_id: str, tutor_message: str):
     url = f"{BASE_URL}/interact"
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "X-Api-Key": API_KEY,
-    }
     payload = {
         "conversation_id": conversation_id,
         "tutor_message": tutor_message,
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _session.post(url, json=payload, headers=AUTH_HEADERS, timeout=TIMEOUT)
     data = response.json()
     return data
 
@@ -105,12 +160,9 @@ def submit_mse_predictions(predictions_dict: dict, set_type: str = SET_TYPE):
     """
     predictions_dict: dict of {(student_id, topic_id): predicted_level}
     """
+    if not predictions_dict:
+        raise ValueError("predictions_dict is empty; nothing to submit")
     url = f"{BASE_URL}/evaluate/mse"
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "X-Api-Key": API_KEY,
-    }
     payload = {
         "predictions": [
             {
@@ -118,26 +170,22 @@ def submit_mse_predictions(predictions_dict: dict, set_type: str = SET_TYPE):
                 "topic_id": topic_id,
                 "predicted_level": predicted_level,
             }
-            for (student_id, topic_id), predicted_level in predictions_dict.items()
+            # sorted so the same predictions always produce the same payload
+            for (student_id, topic_id), predicted_level in sorted(predictions_dict.items())
         ],
         "set_type": set_type,
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _post_with_retry(url, payload, AUTH_HEADERS)
     data = response.json()
     return data
 
 
 def evaluate_tutoring(set_type: str = SET_TYPE):
     url = f"{BASE_URL}/evaluate/tutoring"
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "X-Api-Key": API_KEY,
-    }
     payload = {
         "set_type": set_type
     }
-    response = requests.post(url, json=payload, headers=headers)
+    response = _session.post(url, json=payload, headers=AUTH_HEADERS, timeout=TIMEOUT)
     data = response.json()
     return data
 
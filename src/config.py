@@ -0,0 +1,14 @@
+"""
+Environment configuration. `.env` is loaded once here; other modules
+import the values they need instead of calling load_dotenv() themselves.
+"""
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+
+API_KEY = os.getenv("API_KEY")
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")